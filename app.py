@@ -1,9 +1,12 @@
 import streamlit as st
+import torch
 from ultralytics import YOLO
+from ultralytics.utils.plotting import colors
 from PIL import Image
 import numpy as np
-import io, os, time, json
-from collections import Counter
+import cv2
+import io, os, time
+import orjson
 
 # ---------------------------------------------------
 # Page Setup
@@ -136,18 +139,291 @@ st.markdown(
 # Model Loading
 # ---------------------------------------------------
 MODEL_FILENAME = "PPE.pt"
+# TensorRT INT8 engine exported from PPE.pt (see README); preferred when present
+ENGINE_FILENAME = "PPE.engine"
+# OpenVINO INT8 IR exported from PPE.pt (see README); preferred on CPU-only hosts
+OPENVINO_DIRNAME = "PPE_openvino_model"
+
+# FP16 on the first CUDA GPU when available, plain FP32 on CPU otherwise
+DEVICE = 0 if torch.cuda.is_available() else "cpu"
+USE_HALF = DEVICE != "cpu"
+
+def resolve_model_path():
+    # Best artifact usable on this host: TensorRT engine on GPU, OpenVINO IR on CPU,
+    # PPE.pt anywhere; None when nothing usable is present
+    if DEVICE != "cpu" and os.path.exists(ENGINE_FILENAME):
+        return ENGINE_FILENAME
+    if DEVICE == "cpu" and os.path.isdir(OPENVINO_DIRNAME):
+        return OPENVINO_DIRNAME
+    if os.path.exists(MODEL_FILENAME):
+        return MODEL_FILENAME
+    return None
 
 @st.cache_resource
 def load_yolo_model():
-    model = YOLO(MODEL_FILENAME)
+    model_path = resolve_model_path()
+    if model_path == ENGINE_FILENAME:
+        model = YOLO(ENGINE_FILENAME, task="detect")
+    elif model_path == OPENVINO_DIRNAME:
+        model = YOLO(OPENVINO_DIRNAME, task="detect")
+    else:
+        model = YOLO(MODEL_FILENAME)
+        # pre-fuse Conv+BN once instead of on the first predict
+        try:
+            model.fuse()
+        except Exception:
+            pass
+
+    # Warm-up run so kernel autotuning and memory allocation are paid once here,
+    # not on the first user image
+    model.predict(
+        source=np.zeros((640, 640, 3), dtype=np.uint8),
+        conf=0.40,
+        imgsz=640,
+        half=USE_HALF,
+        device=DEVICE,
+        verbose=False
+    )
     return model
 
-if not os.path.exists(MODEL_FILENAME):
-    st.error("❌ Model file `PPE.pt` not found. Place it in the same folder as `app.py`.")
+if resolve_model_path() is None:
+    if DEVICE != "cpu":
+        st.error("❌ No model found. Place `PPE.pt` (or an exported `PPE.engine`) in the same folder as `app.py`.")
+    else:
+        st.error("❌ No model found. Place `PPE.pt` (or an exported `PPE_openvino_model/`) in the same folder as `app.py`.")
     st.stop()
 
+@st.cache_resource
+def name_to_id(names):
+    # inverted class map so metric lookups are a dict hit, not a scan
+    return {n: cid for cid, n in names.items()}
+
 model = load_yolo_model()
 
+DEFAULT_CLASS_NAMES = {
+    0: 'gloves',
+    1: 'hardhat',
+    2: 'no-gloves',
+    3: 'no-hardhat',
+    4: 'no-vest',
+    5: 'person',
+    6: 'shoes',
+    7: 'vest'
+}
+
+try:
+    CLASS_NAMES = model.model.names
+except Exception:
+    CLASS_NAMES = DEFAULT_CLASS_NAMES
+if isinstance(CLASS_NAMES, (list, tuple)):
+    CLASS_NAMES = dict(enumerate(CLASS_NAMES))
+NAME2ID = name_to_id(CLASS_NAMES)
+
+# Class ids of the roles used for scoring, resolved once (default ids as fallback)
+ROLE_NAMES = ("person", "hardhat", "vest", "shoes", "gloves", "no-hardhat", "no-vest", "no-gloves")
+DEFAULT_NAME2ID = name_to_id(DEFAULT_CLASS_NAMES)
+ROLE_IDS = np.array([NAME2ID.get(n, DEFAULT_NAME2ID[n]) for n in ROLE_NAMES])
+NUM_CLASS_BINS = max(max(CLASS_NAMES), int(ROLE_IDS.max())) + 1
+
+# ---------------------------------------------------
+# Inference & Analytics (shared by upload and webcam)
+# ---------------------------------------------------
+def compute_metrics(counts):
+    # counts: per-class-id detection counts from np.bincount (NUM_CLASS_BINS long);
+    # all role counters come out of a single fancy-index
+    persons, helmets, vests, shoes, gloves, no_helmet, no_vest, no_gloves = counts[ROLE_IDS].tolist()
+
+    non_compliance_flags = no_helmet + no_vest + no_gloves
+
+    # Compliance score (simple heuristic)
+    if persons == 0:
+        compliance_score = 100
+    else:
+        # treat PPE items + vs missing as basic signal
+        compliant_signals = helmets + vests + shoes + gloves
+        risk_signals = non_compliance_flags
+        denom = max(1, compliant_signals + risk_signals)
+        compliance_score = max(0, min(100, int(100 * compliant_signals / denom)))
+
+    return {
+        "counts_by_id": {cid: int(c) for cid, c in enumerate(counts) if c},
+        "persons": persons,
+        "no_helmet": no_helmet,
+        "no_vest": no_vest,
+        "no_gloves": no_gloves,
+        "non_compliance_flags": non_compliance_flags,
+        "compliance_score": compliance_score,
+    }
+
+
+def fast_plot(img_rgb, xyxy, confs, cls_ids):
+    # Draw boxes straight onto the RGB array with OpenCV instead of results[0].plot()
+    lw = max(round(sum(img_rgb.shape[:2]) / 2 * 0.003), 2)
+    font_scale = lw / 3
+    for (x1, y1, x2, y2), c, cid in zip(xyxy.astype(int).tolist(), confs.tolist(), cls_ids.tolist()):
+        color = colors(cid)
+        label = f"{CLASS_NAMES.get(cid, str(cid))} {c:.2f}"
+        (_, th), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, font_scale, max(lw - 1, 1))
+        cv2.rectangle(img_rgb, (x1, y1), (x2, y2), color, lw, cv2.LINE_AA)
+        cv2.putText(
+            img_rgb,
+            label,
+            # keep labels of boxes touching the top edge inside the image
+            (x1, max(th + 2, y1 - 4)),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            font_scale,
+            color,
+            max(lw - 1, 1),
+            cv2.LINE_AA
+        )
+    return img_rgb
+
+
+def decode(img_bytes):
+    # Decoded RGB pixels; only called on an analyze() cache miss, so decoding happens
+    # once per file without keeping a full-resolution array cached
+    return np.array(Image.open(io.BytesIO(img_bytes)).convert("RGB"), dtype=np.uint8)
+
+
+def to_model_array(img_rgb):
+    # Contiguous uint8 BGR (Ultralytics' channel order for arrays): the tensor goes to
+    # the device as 1 byte/pixel and is only cast and normalised there
+    return np.ascontiguousarray(img_rgb[:, :, ::-1])
+
+
+# Keyed on the raw uploaded bytes, so reruns on the same image skip decoding and inference
+@st.cache_data(show_spinner=False, max_entries=16)
+def analyze(img_bytes):
+    img_rgb = decode(img_bytes)
+
+    # Shrink to the 640px letterbox size up front so full-resolution photos are
+    # never copied into a tensor; boxes are scaled back to the original below
+    h, w = img_rgb.shape[:2]
+    scale = min(1.0, 640 / max(w, h))
+    if scale < 1.0:
+        model_input = cv2.resize(
+            img_rgb,
+            (max(1, round(w * scale)), max(1, round(h * scale))),
+            interpolation=cv2.INTER_LINEAR
+        )
+    else:
+        model_input = img_rgb
+
+    t0 = time.time()
+    results = model.predict(
+        source=to_model_array(model_input),
+        conf=0.40,
+        max_det=40,
+        imgsz=640,
+        half=USE_HALF,
+        device=DEVICE
+    )
+    infer_time = time.time() - t0
+
+    # Extract detections
+    boxes = results[0].boxes
+    try:
+        # one device->host copy of the [N, 6] (x1, y1, x2, y2, conf, cls) tensor
+        data = boxes.data.cpu().numpy()
+        xyxy, confs, cls_ids = data[:, :4], data[:, 4], data[:, 5].astype(np.int32)
+    except Exception:
+        xyxy, confs, cls_ids = np.empty((0, 4), np.float32), np.empty(0, np.float32), np.empty(0, np.int32)
+
+    if model_input is not img_rgb and xyxy.size:
+        xyxy = xyxy * np.array(
+            [w / model_input.shape[1], h / model_input.shape[0]] * 2,
+            dtype=xyxy.dtype
+        )
+
+    # .tolist() converts whole columns to Python floats/ints in one go
+    xyxy_l, conf_l, cls_l = xyxy.tolist(), confs.tolist(), cls_ids.tolist()
+    detections_list = [
+        {
+            "x1": b[0], "y1": b[1],
+            "x2": b[2], "y2": b[3],
+            "conf": c,
+            "class_id": cid,
+            "class_name": CLASS_NAMES.get(cid, str(cid))
+        }
+        for b, c, cid in zip(xyxy_l, conf_l, cls_l)
+    ]
+
+    # Annotated image, cached as JPEG bytes rather than a full-resolution array;
+    # drawn in place since img_rgb is not used afterwards
+    plotted = fast_plot(img_rgb, xyxy, confs, cls_ids)
+
+    return {
+        # served both to st.image and the download button, keyed on the upload bytes
+        "annotated_jpeg": encode_jpeg(plotted),
+        "detections": detections_list,
+        "metrics": compute_metrics(np.bincount(cls_ids, minlength=NUM_CLASS_BINS)),
+        "infer_time": infer_time,
+    }
+
+
+def encode_jpeg(rgb):
+    # libjpeg-turbo via OpenCV is considerably faster than PIL's encoder
+    _, jpg = cv2.imencode(".jpg", cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR), [int(cv2.IMWRITE_JPEG_QUALITY), 85])
+    return jpg.tobytes()
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def to_json_bytes(detections_list):
+    return orjson.dumps(detections_list, option=orjson.OPT_INDENT_2)
+
+
+def render_snapshot(metrics, ok_text, risk_text, actions_subtext, closing_action,
+                    helmet_ok_text, helmet_risk_text):
+    counts_by_id = metrics["counts_by_id"]
+    no_helmet = metrics["no_helmet"]
+    no_vest = metrics["no_vest"]
+    no_gloves = metrics["no_gloves"]
+    non_compliance_flags = metrics["non_compliance_flags"]
+
+    def cname(cid):
+        return CLASS_NAMES.get(cid, str(cid))
+
+    # KPI row
+    k1, k2, k3 = st.columns(3)
+    with k1:
+        st.markdown('<div class="kpi-label">Workers detected</div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="kpi-value">{metrics["persons"]}</div>', unsafe_allow_html=True)
+    with k2:
+        st.markdown('<div class="kpi-label">PPE issues flagged</div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="kpi-value">{non_compliance_flags}</div>', unsafe_allow_html=True)
+    with k3:
+        st.markdown('<div class="kpi-label">Compliance score</div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="kpi-value">{metrics["compliance_score"]}%</div>', unsafe_allow_html=True)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Status chips
+    if non_compliance_flags == 0:
+        st.markdown(f"<span class='chip-ok'>{ok_text}</span>", unsafe_allow_html=True)
+    else:
+        st.markdown(f"<span class='chip-risk'>{risk_text}</span>", unsafe_allow_html=True)
+
+    # Detailed breakdown badges
+    st.markdown("<br><br><div class='section-title'>Detected Items</div>", unsafe_allow_html=True)
+    # one element for all badges instead of one st.markdown per class
+    st.markdown(
+        "".join(f"<span class='badge'>{cname(cid)}: {cnt}</span>" for cid, cnt in counts_by_id.items()),
+        unsafe_allow_html=True
+    )
+
+    # Risk & Action panel
+    st.markdown("<br><div class='section-title'>Risk & Suggested Actions</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='subtext'>{actions_subtext}</div>", unsafe_allow_html=True)
+    st.markdown("\n".join([
+        "- ⚠️ **Helmet issues**: " +
+        (helmet_ok_text if no_helmet == 0 else helmet_risk_text.format(no_helmet)),
+        "- ⚠️ **Vest issues**: " +
+        ("none observed." if no_vest == 0 else f"{no_vest} worker(s) without high-visibility vest."),
+        "- ⚠️ **Gloves issues**: " +
+        ("none observed." if no_gloves == 0 else f"{no_gloves} worker(s) without gloves."),
+        closing_action,
+    ]))
+
 # ---------------------------------------------------
 # Top 3 info cards (product & business oriented)
 # ---------------------------------------------------
@@ -209,12 +485,12 @@ with left_col:
     st.markdown('</div>', unsafe_allow_html=True)
 
     annotated = None
+    analysis = None
     detections_list = []
     infer_time = None
-    class_names = {}
 
     if uploaded:
-        input_image = Image.open(uploaded).convert("RGB")
+        input_image = uploaded.getvalue()
         st.markdown('<div class="card">', unsafe_allow_html=True)
         st.markdown('<div class="section-title">🖼️ Input</div>', unsafe_allow_html=True)
         st.image(input_image, caption="Uploaded Image", use_container_width=True)
@@ -224,18 +500,10 @@ with left_col:
         st.markdown('<div class="card">', unsafe_allow_html=True)
         st.markdown('<div class="section-title">🤖 Detection Results</div>', unsafe_allow_html=True)
         with st.spinner("Running PPE detection…"):
-            t0 = time.time()
-            results = model.predict(
-                source=np.asarray(input_image),
-                conf=0.40,
-                max_det=40,
-                imgsz=640
-            )
-            infer_time = time.time() - t0
-
-        # Annotated image
-        plotted = results[0].plot()
-        annotated = Image.fromarray(plotted)
+            analysis = analyze(uploaded.getvalue())
+        infer_time = analysis["infer_time"]
+
+        annotated = analysis["annotated_jpeg"]
         st.image(
             annotated,
             caption=f"Detections (processed in {infer_time:.2f}s)",
@@ -243,37 +511,7 @@ with left_col:
         )
         st.markdown('</div>', unsafe_allow_html=True)
 
-        # Extract detections
-        boxes = results[0].boxes
-        try:
-            xyxy = boxes.xyxy.cpu().numpy()
-            confs = boxes.conf.cpu().numpy()
-            cls_ids = boxes.cls.cpu().numpy().astype(int)
-        except Exception:
-            xyxy, confs, cls_ids = np.array([]), np.array([]), np.array([])
-
-        try:
-            class_names = model.model.names
-        except Exception:
-            class_names = {
-                0: 'gloves',
-                1: 'hardhat',
-                2: 'no-gloves',
-                3: 'no-hardhat',
-                4: 'no-vest',
-                5: 'person',
-                6: 'shoes',
-                7: 'vest'
-            }
-
-        for (b, c, cid) in zip(xyxy, confs, cls_ids):
-            detections_list.append({
-                "x1": float(b[0]), "y1": float(b[1]),
-                "x2": float(b[2]), "y2": float(b[3]),
-                "conf": float(c),
-                "class_id": int(cid),
-                "class_name": class_names.get(int(cid), str(cid))
-            })
+        detections_list = analysis["detections"]
 
 # -------------------- RIGHT: Business View & Insights --------------------
 with right_col:
@@ -284,97 +522,15 @@ with right_col:
     if not detections_list:
         st.markdown("<br><i>No detections yet. Upload an image to see analytics.</i>", unsafe_allow_html=True)
     else:
-        # Aggregate counts
-        counts_by_id = Counter([d["class_id"] for d in detections_list])
-
-        # Try resolving names
-        def cname(cid):
-            if isinstance(class_names, dict):
-                return class_names.get(cid, str(cid))
-            if isinstance(class_names, list) and cid < len(class_names):
-                return class_names[cid]
-            return str(cid)
-
-        # Map some semantic roles
-        persons = counts_by_id.get(
-            next((k for k,v in class_names.items() if v == "person"), 5),
-            0
-        ) if isinstance(class_names, dict) else counts_by_id.get(5, 0)
-
-        # lookups
-        def count_by_name(name, default_id):
-            if isinstance(class_names, dict):
-                match_ids = [cid for cid, n in class_names.items() if n == name]
-                if match_ids:
-                    return sum(counts_by_id.get(cid, 0) for cid in match_ids)
-                return counts_by_id.get(default_id, 0)
-            else:
-                # assume fixed mapping order if list
-                mapping = {
-                    "gloves": 0, "hardhat": 1, "no-gloves": 2, "no-hardhat": 3,
-                    "no-vest": 4, "person": 5, "shoes": 6, "vest": 7
-                }
-                cid = mapping.get(name, default_id)
-                return counts_by_id.get(cid, 0)
-
-        helmets = count_by_name("hardhat", 1)
-        vests = count_by_name("vest", 7)
-        shoes = count_by_name("shoes", 6)
-        no_helmet = count_by_name("no-hardhat", 3)
-        no_vest = count_by_name("no-vest", 4)
-        no_gloves = count_by_name("no-gloves", 2)
-        gloves = count_by_name("gloves", 0)
-
-        non_compliance_flags = no_helmet + no_vest + no_gloves
-
-        # Compliance score (simple heuristic)
-        if persons == 0:
-            compliance_score = 100
-        else:
-            # treat PPE items + vs missing as basic signal
-            compliant_signals = helmets + vests + shoes + gloves
-            risk_signals = non_compliance_flags
-            denom = max(1, compliant_signals + risk_signals)
-            compliance_score = max(0, min(100, int(100 * compliant_signals / denom)))
-
-        # KPI row
-        k1, k2, k3 = st.columns(3)
-        with k1:
-            st.markdown('<div class="kpi-label">Workers detected</div>', unsafe_allow_html=True)
-            st.markdown(f'<div class="kpi-value">{persons}</div>', unsafe_allow_html=True)
-        with k2:
-            st.markdown('<div class="kpi-label">PPE issues flagged</div>', unsafe_allow_html=True)
-            st.markdown(f'<div class="kpi-value">{non_compliance_flags}</div>', unsafe_allow_html=True)
-        with k3:
-            st.markdown('<div class="kpi-label">Compliance score</div>', unsafe_allow_html=True)
-            st.markdown(f'<div class="kpi-value">{compliance_score}%</div>', unsafe_allow_html=True)
-
-        st.markdown("<br>", unsafe_allow_html=True)
-
-        # Status chips
-        if non_compliance_flags == 0:
-            st.markdown("<span class='chip-ok'>Site looks compliant based on this frame</span>", unsafe_allow_html=True)
-        else:
-            st.markdown("<span class='chip-risk'>Potential PPE issues detected in this frame</span>", unsafe_allow_html=True)
-
-        # Detailed breakdown badges
-        st.markdown("<br><br><div class='section-title'>Detected Items</div>", unsafe_allow_html=True)
-        for cid, cnt in counts_by_id.items():
-            st.markdown(
-                f"<span class='badge'>{cname(cid)}: {cnt}</span>",
-                unsafe_allow_html=True
-            )
-
-        # Risk & Action panel
-        st.markdown("<br><div class='section-title'>Risk & Suggested Actions</div>", unsafe_allow_html=True)
-        st.markdown("<div class='subtext'>Turn detections into actions a safety manager can take.</div>", unsafe_allow_html=True)
-        st.write("- ⚠️ **Helmet issues**: " +
-                 ("none observed in this frame." if no_helmet == 0 else f"{no_helmet} worker(s) flagged without helmet."))
-        st.write("- ⚠️ **Vest issues**: " +
-                 ("none observed." if no_vest == 0 else f"{no_vest} worker(s) without high-visibility vest."))
-        st.write("- ⚠️ **Gloves issues**: " +
-                 ("none observed." if no_gloves == 0 else f"{no_gloves} worker(s) without gloves."))
-        st.write("- ✅ Consider integrating this pipeline with CCTV feeds or site-capture apps to automatically log non-compliant frames.")
+        render_snapshot(
+            analysis["metrics"],
+            ok_text="Site looks compliant based on this frame",
+            risk_text="Potential PPE issues detected in this frame",
+            actions_subtext="Turn detections into actions a safety manager can take.",
+            closing_action="- ✅ Consider integrating this pipeline with CCTV feeds or site-capture apps to automatically log non-compliant frames.",
+            helmet_ok_text="none observed in this frame.",
+            helmet_risk_text="{} worker(s) flagged without helmet."
+        )
 
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -384,18 +540,16 @@ with right_col:
         st.markdown('<div class="section-title">📥 Export</div>', unsafe_allow_html=True)
         st.markdown('<div class="subtext">Use these exports in reports, presentations or audit documentation.</div>', unsafe_allow_html=True)
 
-        buf = io.BytesIO()
-        annotated.save(buf, format="JPEG")
         st.download_button(
             "Download annotated image",
-            data=buf.getvalue(),
+            data=analysis["annotated_jpeg"],
             file_name="ppe_detection.jpg",
             mime="image/jpeg"
         )
 
         st.download_button(
             "Download raw detection JSON",
-            data=json.dumps(detections_list, indent=2),
+            data=to_json_bytes(detections_list),
             file_name="detections.json",
             mime="application/json"
         )
@@ -415,21 +569,14 @@ st.markdown(
 cam_image = st.camera_input("Use webcam (optional)")
 
 if cam_image is not None:
-    cam_pil = Image.open(cam_image).convert("RGB")
-    st.image(cam_pil, caption="Webcam Frame", use_container_width=True)
+    cam_frame = cam_image.getvalue()
+    st.image(cam_frame, caption="Webcam Frame", use_container_width=True)
 
     with st.spinner("Analyzing webcam frame…"):
-        t0_cam = time.time()
-        cam_results = model.predict(
-            source=np.asarray(cam_pil),
-            conf=0.40,
-            max_det=40,
-            imgsz=640
-        )
-        cam_infer_time = time.time() - t0_cam
+        cam_analysis = analyze(cam_image.getvalue())
+    cam_infer_time = cam_analysis["infer_time"]
 
-    cam_plotted = cam_results[0].plot()
-    cam_annotated = Image.fromarray(cam_plotted)
+    cam_annotated = cam_analysis["annotated_jpeg"]
 
     st.image(
         cam_annotated,
@@ -438,37 +585,7 @@ if cam_image is not None:
     )
 
     # -------------------- Webcam Compliance Analytics --------------------
-    # Extract detections
-    cam_boxes = cam_results[0].boxes
-    cam_detections = []
-    try:
-        cam_xyxy = cam_boxes.xyxy.cpu().numpy()
-        cam_confs = cam_boxes.conf.cpu().numpy()
-        cam_cls_ids = cam_boxes.cls.cpu().numpy().astype(int)
-    except Exception:
-        cam_xyxy, cam_confs, cam_cls_ids = np.array([]), np.array([]), np.array([])
-
-    # Class names fallback
-    try:
-        cam_class_names = model.model.names
-    except Exception:
-        cam_class_names = {
-            0: 'gloves',
-            1: 'hardhat',
-            2: 'no-gloves',
-            3: 'no-hardhat',
-            4: 'no-vest',
-            5: 'person',
-            6: 'shoes',
-            7: 'vest'
-        }
-
-    for (b, c, cid) in zip(cam_xyxy, cam_confs, cam_cls_ids):
-        cam_detections.append({
-            "class_id": int(cid),
-            "class_name": cam_class_names.get(int(cid), str(cid)),
-            "conf": float(c)
-        })
+    cam_detections = cam_analysis["detections"]
 
     # Compliance summary card
     st.markdown("<br><div class='card'>", unsafe_allow_html=True)
@@ -478,80 +595,15 @@ if cam_image is not None:
     if not cam_detections:
         st.markdown("<br><i>No PPE detections found in this webcam frame.</i>", unsafe_allow_html=True)
     else:
-        from collections import Counter
-
-        counts_by_id = Counter([d["class_id"] for d in cam_detections])
-
-        # Utility
-        def cname(cid):
-            return cam_class_names.get(cid, str(cid))
-
-        # Count helpers
-        def count(name, fallback):
-            match = [cid for cid,n in cam_class_names.items() if n == name]
-            if match:
-                return sum(counts_by_id.get(cid, 0) for cid in match)
-            return counts_by_id.get(fallback, 0)
-
-        persons = count("person", 5)
-        helmets = count("hardhat", 1)
-        vests = count("vest", 7)
-        shoes = count("shoes", 6)
-        no_helmet = count("no-hardhat", 3)
-        no_vest = count("no-vest", 4)
-        no_gloves = count("no-gloves", 2)
-        gloves = count("gloves", 0)
-
-        non_compliance_flags = no_helmet + no_vest + no_gloves
-
-        # Compliance score
-        if persons == 0:
-            compliance_score = 100
-        else:
-            compliant_sig = helmets + vests + shoes + gloves
-            risk_sig = non_compliance_flags
-            denom = max(1, compliant_sig + risk_sig)
-            compliance_score = max(0, min(100, int(100 * compliant_sig / denom)))
-
-        # KPIs
-        k1, k2, k3 = st.columns(3)
-        with k1:
-            st.markdown('<div class="kpi-label">Workers detected</div>', unsafe_allow_html=True)
-            st.markdown(f'<div class="kpi-value">{persons}</div>', unsafe_allow_html=True)
-        with k2:
-            st.markdown('<div class="kpi-label">PPE issues flagged</div>', unsafe_allow_html=True)
-            st.markdown(f'<div class="kpi-value">{non_compliance_flags}</div>', unsafe_allow_html=True)
-        with k3:
-            st.markdown('<div class="kpi-label">Compliance score</div>', unsafe_allow_html=True)
-            st.markdown(f'<div class="kpi-value">{compliance_score}%</div>', unsafe_allow_html=True)
-
-        st.markdown("<br>", unsafe_allow_html=True)
-
-        # Status chip
-        if non_compliance_flags == 0:
-            st.markdown("<span class='chip-ok'>Webcam frame looks compliant</span>", unsafe_allow_html=True)
-        else:
-            st.markdown("<span class='chip-risk'>PPE issues detected in webcam frame</span>", unsafe_allow_html=True)
-
-        # Detailed counts
-        st.markdown("<br><br><div class='section-title'>Detected Items</div>", unsafe_allow_html=True)
-        for cid, cnt in counts_by_id.items():
-            st.markdown(
-                f"<span class='badge'>{cname(cid)}: {cnt}</span>",
-                unsafe_allow_html=True
-            )
-
-        # Actions
-        st.markdown("<br><div class='section-title'>Risk & Suggested Actions</div>", unsafe_allow_html=True)
-        st.markdown("<div class='subtext'>Real-time recommendations derived from webcam analysis.</div>", unsafe_allow_html=True)
-
-        st.write("- ⚠️ **Helmet issues**: " +
-                 ("none observed." if no_helmet == 0 else f"{no_helmet} worker(s) without helmet."))
-        st.write("- ⚠️ **Vest issues**: " +
-                 ("none observed." if no_vest == 0 else f"{no_vest} worker(s) without high-visibility vest."))
-        st.write("- ⚠️ **Gloves issues**: " +
-                 ("none observed." if no_gloves == 0 else f"{no_gloves} worker(s) without gloves."))
-        st.write("- 🔄 Capture another frame for updated risk assessment.")
+        render_snapshot(
+            cam_analysis["metrics"],
+            ok_text="Webcam frame looks compliant",
+            risk_text="PPE issues detected in webcam frame",
+            actions_subtext="Real-time recommendations derived from webcam analysis.",
+            closing_action="- 🔄 Capture another frame for updated risk assessment.",
+            helmet_ok_text="none observed.",
+            helmet_risk_text="{} worker(s) without helmet."
+        )
 
     st.markdown("</div>", unsafe_allow_html=True)
 